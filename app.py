@@ -4,19 +4,24 @@
 # -----------------------------------------------
 
 import os, re, traceback
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
-from des.des_core import DES
+from flask import Flask, render_template, request, jsonify
+from des.des_core import preferred_engine
 from des.modes import ECB, CBC, CFB, OFB, CTR
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
+# سریع‌ترین موتور موجود (numba، OpenSSL یا پایتون خالص)
+DES_ENGINE = preferred_engine()
+
+MODE_MAP = {"ECB": ECB, "CBC": CBC, "CFB": CFB, "OFB": OFB, "CTR": CTR}
+
 
 # ---------------------- #
 # Helper Functions       #
 # ---------------------- #
 def is_ascii(s: str) -> bool:
-    return bool(re.fullmatch(r"[ -~]*", s))  # printable ASCII range
+    return s.isascii() and s.isprintable()  # printable ASCII range (0x20-0x7E)
 
 
 def error_response(context, msg, code=400, as_json=False):
@@ -31,20 +36,17 @@ def error_response(context, msg, code=400, as_json=False):
 # ---------------------- #
 @app.route("/", methods=["GET"])
 def index():
-    context = session.pop(
-        "context",
-        {
-            "plaintext": "",
-            "key": "",
-            "rounds": 16,
-            "block_size": 64,
-            "key_length": 64,
-            "mode": "CBC",
-            "operation": "encrypt",
-            "iv": "12345678",
-            "result": "",
-        },
-    )
+    context = {
+        "plaintext": "",
+        "key": "",
+        "rounds": 16,
+        "block_size": 64,
+        "key_length": 64,
+        "mode": "CBC",
+        "operation": "encrypt",
+        "iv": "12345678",
+        "result": "",
+    }
     return render_template("index.html", **context)
 
 
@@ -53,7 +55,12 @@ def index():
 # ---------------------- #
 @app.route("/process", methods=["POST"])
 def process():
-    data = request.get_json(force=True) if request.is_json else request.form
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return error_response({}, "⚠️ بدنه‌ی درخواست باید یک شیء JSON باشد.", 400, True)
+    else:
+        data = request.form
 
     # پاک‌سازی ورودی دورها
     raw_rounds = str(data.get("rounds", "16")).strip()
@@ -88,6 +95,9 @@ def process():
     if not pt or not key:
         return error_response(context, "⚠️ متن یا کلید نمی‌تواند خالی باشد.", 400, request.is_json)
 
+    if mode not in MODE_MAP:
+        return error_response(context, "⚠️ حالت رمزنگاری نامعتبر است.", 400, request.is_json)
+
     # ✅ محدودیت طول کلید به بازه‌ی 1 تا 7 کاراکتر (حداکثر 56 بیت)
     key_len = len(key)
     if key_len < 1 or key_len > 7:
@@ -118,9 +128,8 @@ def process():
         iv = None
 
     try:
-        des_engine = DES(key.encode(), iv=iv.encode() if iv else None, mode=mode)
-        mode_map = {"ECB": ECB, "CBC": CBC, "CFB": CFB, "OFB": OFB, "CTR": CTR}
-        ctx = mode_map[mode](des_engine)
+        des_engine = DES_ENGINE(key.encode(), iv=iv.encode() if iv else None, mode=mode)
+        ctx = MODE_MAP[mode](des_engine)
 
         if context["operation"] == "encrypt":
             result = ctx.encrypt(pt.encode()).hex()
@@ -132,8 +141,7 @@ def process():
         if request.is_json:
             return jsonify({"result": result, "mode": mode, "operation": context["operation"]})
 
-        session["context"] = context
-        return redirect(url_for("index"))
+        return render_template("index.html", **context)
 
     except Exception as e:
         traceback.print_exc()
@@ -145,13 +153,18 @@ def process():
 # ---------------------- #
 @app.route("/api/encrypt", methods=["POST"])
 def api_encrypt():
-    data = request.get_json(force=True)
+    # بدون هدر JSON هم بدنه را می‌پذیریم (مثل curl -d)
+    data = request.get_json(force=True, silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
     plaintext, key = data.get("plaintext", ""), data.get("key", "")
     iv = data.get("iv", "")
     mode = data.get("mode", "CBC").upper()
+    if mode not in MODE_MAP:
+        return jsonify({"error": f"Unsupported mode: {mode}"}), 400
     try:
-        des_engine = DES(key.encode(), iv=iv.encode() if iv else None, mode=mode)
-        ctx = {"ECB": ECB, "CBC": CBC, "CFB": CFB, "OFB": OFB, "CTR": CTR}[mode](des_engine)
+        des_engine = DES_ENGINE(key.encode(), iv=iv.encode() if iv else None, mode=mode)
+        ctx = MODE_MAP[mode](des_engine)
         result = ctx.encrypt(plaintext.encode()).hex()
         return jsonify({"ciphertext": result, "mode": mode})
     except Exception as e:
@@ -161,13 +174,18 @@ def api_encrypt():
 
 @app.route("/api/decrypt", methods=["POST"])
 def api_decrypt():
-    data = request.get_json(force=True)
+    # بدون هدر JSON هم بدنه را می‌پذیریم (مثل curl -d)
+    data = request.get_json(force=True, silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
     ciphertext, key = data.get("ciphertext", ""), data.get("key", "")
     iv = data.get("iv", "")
     mode = data.get("mode", "CBC").upper()
+    if mode not in MODE_MAP:
+        return jsonify({"error": f"Unsupported mode: {mode}"}), 400
     try:
-        des_engine = DES(key.encode(), iv=iv.encode() if iv else None, mode=mode)
-        ctx = {"ECB": ECB, "CBC": CBC, "CFB": CFB, "OFB": OFB, "CTR": CTR}[mode](des_engine)
+        des_engine = DES_ENGINE(key.encode(), iv=iv.encode() if iv else None, mode=mode)
+        ctx = MODE_MAP[mode](des_engine)
         result = ctx.decrypt(bytes.fromhex(ciphertext)).decode(errors="ignore")
         return jsonify({"plaintext": result, "mode": mode})
     except Exception as e:
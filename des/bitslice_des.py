@@ -0,0 +1,89 @@
+# des/bitslice_des.py
+from typing import Sequence
+
+import numpy as np
+
+from .tables import E_BOX, P_BOX, S_BOXES
+
+# ==============================================================================
+# 1. Bitsliced Layout
+# ==============================================================================
+# A batch of 64*n blocks is stored as a (64, n) uint64 array: row b holds bit b
+# (DES numbering, MSB first) of every block, lane j of column g belongs to
+# block g*64 + j. One XOR/AND on a row then works on 64 blocks at once.
+
+LANES = 64
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+E_INDEX = np.array([i - 1 for i in E_BOX], dtype=np.intp)
+P_INDEX = np.array([i - 1 for i in P_BOX], dtype=np.intp)
+
+_BIT_SHIFTS = np.arange(63, -1, -1, dtype=np.uint64)
+
+
+def _build_sbox_gates() -> np.ndarray:
+    # Truth table of each S-box output bit, as all-zero / all-one lanes.
+    # Shape (8, 4, 64, 1): box, output bit (MSB first), 6-bit input chunk.
+    table = np.zeros((8, 4, 64, 1), dtype=np.uint64)
+    for i, s_box in enumerate(S_BOXES):
+        for chunk in range(64):
+            row = ((chunk >> 4) & 0x2) | (chunk & 0x1)
+            col = (chunk >> 1) & 0xF
+            s_val = s_box[row * 16 + col]
+            for o in range(4):
+                if (s_val >> (3 - o)) & 1:
+                    table[i, o, chunk, 0] = ALL_ONES
+    return table
+
+SBOX_GATES = _build_sbox_gates()
+
+
+def to_bitslice(blocks: np.ndarray) -> np.ndarray:
+    n = len(blocks) // LANES
+    bits = (blocks.reshape(n, LANES)[None, :, :] >> _BIT_SHIFTS[:, None, None]) & np.uint64(1)
+    packed = np.packbits(bits.astype(np.uint8), axis=-1, bitorder='little')
+    return np.ascontiguousarray(packed).view('<u8').reshape(64, n)
+
+
+def from_bitslice(lanes: np.ndarray) -> np.ndarray:
+    n = lanes.shape[1]
+    bits = np.unpackbits(lanes.astype('<u8').view(np.uint8).reshape(64, n, 8),
+                         axis=-1, bitorder='little')
+    packed = np.packbits(bits.transpose(1, 2, 0), axis=-1, bitorder='big')
+    return np.ascontiguousarray(packed).view('>u8').reshape(n * LANES).astype(np.uint64)
+
+# ==============================================================================
+# 2. Bitsliced Rounds
+# ==============================================================================
+
+def _key_masks(subkey: int) -> np.ndarray:
+    subkey = int(subkey)
+    bits = [(subkey >> (47 - k)) & 1 for k in range(48)]
+    return np.array([ALL_ONES if b else 0 for b in bits], dtype=np.uint64)[:, None]
+
+
+def _sbox_layer(x: np.ndarray) -> np.ndarray:
+    # Evaluate all 8 S-boxes as a multiplexer network over their 6 input rows,
+    # consuming the least significant input bit first.
+    n = x.shape[1]
+    inputs = x.reshape(8, 6, n)
+    v = SBOX_GATES
+    for bit in range(5, -1, -1):
+        sel = inputs[:, bit, :][:, None, None, :]
+        v = v.reshape(8, 4, v.shape[2] // 2, 2, v.shape[3])
+        lo, hi = v[:, :, :, 0, :], v[:, :, :, 1, :]
+        v = lo ^ ((lo ^ hi) & sel)
+    return v.reshape(32, n)
+
+
+def encrypt_blocks(blocks: np.ndarray, subkeys: Sequence[int]) -> np.ndarray:
+    if len(blocks) % LANES:
+        raise ValueError(f"Bitsliced DES needs a multiple of {LANES} blocks, got {len(blocks)}")
+
+    lanes = to_bitslice(blocks)
+    L, R = lanes[:32], lanes[32:]
+    for K in subkeys:
+        x = R[E_INDEX] ^ _key_masks(K)
+        f = _sbox_layer(x)[P_INDEX]
+        L, R = R, L ^ f
+    return from_bitslice(np.concatenate((R, L)))
@@ -1,7 +1,6 @@
 # des/modes.py
-from typing import List
+import numpy as np
 from .des_core import DES
-from copy import deepcopy
 
 # ===========
 # Padding: PKCS#7
@@ -21,6 +20,15 @@ def unpad(data: bytes, block_size: int = 8) -> bytes:
         return data
     return data[:-padding_len]
 
+# ===========
+# XOR helpers
+# ===========
+def _xor8(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    return (np.frombuffer(data, dtype=np.uint8) ^ np.frombuffer(keystream, dtype=np.uint8)).tobytes()
+
 # ===========
 # Base Mode
 # ===========
@@ -29,8 +37,8 @@ class _BaseMode:
         self.des = des_engine
         if des_engine:
             self.block_size_bytes = self.des.block_size // 8
-            # Use deepcopy for iv to avoid mutation side-effects
-            self.iv = deepcopy(self.des.iv)
+            # bytes is immutable, so the engine's iv can be shared as-is
+            self.iv = self.des.iv
         else:
             self.block_size_bytes = 0
             self.iv = None
@@ -38,12 +46,7 @@ class _BaseMode:
     def set_des_engine(self, des_engine: DES):
         self.des = des_engine
         self.block_size_bytes = self.des.block_size // 8
-        self.iv = deepcopy(self.des.iv)
-
-    def _get_blocks(self, data: bytes) -> List[bytes]:
-        if not self.block_size_bytes:
-            raise ValueError("DES engine or block size not set")
-        return [data[i:i+self.block_size_bytes] for i in range(0, len(data), self.block_size_bytes)]
+        self.iv = self.des.iv
 
     def encrypt(self, plaintext: bytes) -> bytes:
         if not self.des:
@@ -64,16 +67,13 @@ class ECB(_BaseMode):
         if not self.des:
             raise ValueError("DES engine not set")
 
-        padded = pad(plaintext, self.block_size_bytes)
-        encrypted = [self.des.encrypt_block(b) for b in self._get_blocks(padded)]
-        return b''.join(encrypted)
+        return self.des.encrypt_ecb(pad(plaintext, self.block_size_bytes))
 
     def decrypt(self, ciphertext: bytes) -> bytes:
         if not self.des:
             raise ValueError("DES engine not set")
 
-        decrypted = [self.des.decrypt_block(b) for b in self._get_blocks(ciphertext)]
-        return unpad(b''.join(decrypted), self.block_size_bytes)
+        return unpad(self.des.decrypt_ecb(ciphertext), self.block_size_bytes)
 
 
 # ===========
@@ -86,17 +86,7 @@ class CBC(_BaseMode):
         if not self.iv:
             raise ValueError("IV must be set for CBC mode")
 
-        padded = pad(plaintext, self.block_size_bytes)
-        encrypted_blocks = []
-        previous_block = self.iv
-
-        for block in self._get_blocks(padded):
-            xored = bytes(p ^ c for p, c in zip(block, previous_block))
-            cipher_block = self.des.encrypt_block(xored)
-            encrypted_blocks.append(cipher_block)
-            previous_block = cipher_block
-        
-        return b''.join(encrypted_blocks)
+        return self.des.encrypt_cbc(pad(plaintext, self.block_size_bytes), self.iv)
 
     def decrypt(self, ciphertext: bytes) -> bytes:
         if not self.des:
@@ -104,16 +94,7 @@ class CBC(_BaseMode):
         if not self.iv:
             raise ValueError("IV must be set for CBC mode")
 
-        decrypted_blocks = []
-        previous_block = self.iv
-
-        for block in self._get_blocks(ciphertext):
-            decrypted_block = self.des.decrypt_block(block)
-            plain_block = bytes(d ^ p for d, p in zip(decrypted_block, previous_block))
-            decrypted_blocks.append(plain_block)
-            previous_block = block
-        
-        return unpad(b''.join(decrypted_blocks), self.block_size_bytes)
+        return unpad(self.des.decrypt_cbc(ciphertext, self.iv), self.block_size_bytes)
 
 # ===========
 # CFB Mode
@@ -126,16 +107,16 @@ class CFB(_BaseMode):
             raise ValueError("IV must be set for CFB mode")
 
         padded = pad(plaintext, self.block_size_bytes)
-        encrypted_blocks = []
+        bs = self.block_size_bytes
+        out = bytearray(len(padded))
         prev_cipher = self.iv
 
-        for block in self._get_blocks(padded):
+        for i in range(0, len(padded), bs):
             encrypted_iv = self.des.encrypt_block(prev_cipher)
-            cipher_block = bytes(p ^ e for p, e in zip(block, encrypted_iv))
-            encrypted_blocks.append(cipher_block)
-            prev_cipher = cipher_block
+            prev_cipher = _xor8(padded[i:i+bs], encrypted_iv)
+            out[i:i+bs] = prev_cipher
         
-        return b''.join(encrypted_blocks)
+        return bytes(out)
 
     def decrypt(self, ciphertext: bytes) -> bytes:
         if not self.des:
@@ -143,21 +124,33 @@ class CFB(_BaseMode):
         if not self.iv:
             raise ValueError("IV must be set for CFB mode")
 
-        decrypted_blocks = []
+        bs = self.block_size_bytes
+        out = bytearray(len(ciphertext))
         prev_cipher = self.iv
 
-        for block in self._get_blocks(ciphertext):
+        for i in range(0, len(ciphertext), bs):
+            block = ciphertext[i:i+bs]
             encrypted_iv = self.des.encrypt_block(prev_cipher)
-            plain_block = bytes(c ^ e for c, e in zip(block, encrypted_iv))
-            decrypted_blocks.append(plain_block)
+            out[i:i+bs] = _xor8(block, encrypted_iv[:len(block)])
             prev_cipher = block
         
-        return unpad(b''.join(decrypted_blocks), self.block_size_bytes)
+        return unpad(bytes(out), self.block_size_bytes)
 
 # ===========
 # OFB Mode
 # ===========
 class OFB(_BaseMode):
+    def _keystream(self, length: int) -> bytes:
+        bs = self.block_size_bytes
+        keystream = bytearray(-(-length // bs) * bs)
+        feedback = self.iv
+
+        for i in range(0, len(keystream), bs):
+            feedback = self.des.encrypt_block(feedback)
+            keystream[i:i+bs] = feedback
+        
+        return bytes(keystream[:length])
+
     def encrypt(self, plaintext: bytes) -> bytes:
         if not self.des:
             raise ValueError("DES engine not set")
@@ -165,25 +158,30 @@ class OFB(_BaseMode):
             raise ValueError("IV must be set for OFB mode")
 
         padded = pad(plaintext, self.block_size_bytes)
-        encrypted_blocks = []
-        feedback = self.iv
-
-        for block in self._get_blocks(padded):
-            output_block = self.des.encrypt_block(feedback)
-            cipher_block = bytes(p ^ o for p, o in zip(block, output_block))
-            encrypted_blocks.append(cipher_block)
-            feedback = output_block
-        
-        return b''.join(encrypted_blocks)
+        return _xor_bytes(padded, self._keystream(len(padded)))
 
     def decrypt(self, ciphertext: bytes) -> bytes:
-        # OFB decryption same as encryption
-        return self.encrypt(ciphertext)
+        if not self.des:
+            raise ValueError("DES engine not set")
+        if not self.iv:
+            raise ValueError("IV must be set for OFB mode")
+
+        # Same keystream as encryption, but the ciphertext is not padded again
+        plain = _xor_bytes(ciphertext, self._keystream(len(ciphertext)))
+        return unpad(plain, self.block_size_bytes)
 
 # ===========
 # CTR Mode
 # ===========
 class CTR(_BaseMode):
+    def _keystream(self, length: int) -> bytes:
+        n_blocks = -(-length // self.block_size_bytes)
+
+        # Build every counter block up front (wrapping at 2**64) and encrypt them in one call
+        counter = np.uint64(int.from_bytes(self.iv, 'big'))
+        counters = (counter + np.arange(n_blocks, dtype=np.uint64)).astype('>u8').tobytes()
+        return self.des.encrypt_ecb(counters)[:length]
+
     def encrypt(self, plaintext: bytes) -> bytes:
         if not self.des:
             raise ValueError("DES engine not set")
@@ -191,19 +189,14 @@ class CTR(_BaseMode):
             raise ValueError("IV must be set for CTR mode")
 
         padded = pad(plaintext, self.block_size_bytes)
-        encrypted_blocks = []
-        counter = int.from_bytes(self.iv, 'big')
-        block_len = self.block_size_bytes
-
-        for block in self._get_blocks(padded):
-            counter_block = counter.to_bytes(block_len, 'big')
-            output_block = self.des.encrypt_block(counter_block)
-            cipher_block = bytes(p ^ o for p, o in zip(block, output_block))
-            encrypted_blocks.append(cipher_block)
-            counter += 1
-        
-        return b''.join(encrypted_blocks)
+        return _xor_bytes(padded, self._keystream(len(padded)))
 
     def decrypt(self, ciphertext: bytes) -> bytes:
-        # CTR decryption same as encryption
-        return self.encrypt(ciphertext)
+        if not self.des:
+            raise ValueError("DES engine not set")
+        if not self.iv:
+            raise ValueError("IV must be set for CTR mode")
+
+        # Same keystream as encryption, but the ciphertext is not padded again
+        plain = _xor_bytes(ciphertext, self._keystream(len(ciphertext)))
+        return unpad(plain, self.block_size_bytes)
@@ -1,9 +1,13 @@
 # testsuite.py — Final Stable Version
 # Ali Akbar Davanmard • 2025-10-20
 
+import hashlib
 import itertools
 from datetime import datetime
-from des import modes, des_core
+
+import numpy as np
+
+from des import modes, des_core, bitslice_des
 
 # Fixed sample plaintext / key pattern
 sample_plaintext = "HelloAliAkbarDES"
@@ -42,9 +46,10 @@ for mode_name, block_size, key_length, rounds in itertools.product(modes_list, b
             iv=iv
         )
 
-        # --- Encrypt & Decrypt ---
-        encrypted = des.encrypt(plaintext_bytes)
-        decrypted = des.decrypt(encrypted)
+        # --- Encrypt & Decrypt (through the mode) ---
+        ctx = mode_class(des)
+        encrypted = ctx.encrypt(plaintext_bytes)
+        decrypted = ctx.decrypt(encrypted)
 
         # --- Decode bytes to string ---
         decrypted_text = decrypted.decode("utf-8", errors="ignore")
@@ -60,6 +65,67 @@ for mode_name, block_size, key_length, rounds in itertools.product(modes_list, b
         print(f"[{total_tests}/135] Mode={mode_name}, Block={block_size}, KeyLen={key_length}, Rounds={rounds} → ❌ ERROR: {e}")
         report_lines.append(f"{mode_name},{block_size},{key_length},{rounds},ERROR:{e}")
 
+# --- Known-answer checks ---
+# Expected values come from the original bit-string implementation.
+# Each engine must reproduce them, not just round-trip its own output.
+kat_key = b"AliKey12"
+kat_block = b"HelloAli"
+kat_vectors = {
+    # rounds: (ciphertext of kat_block, sha256 of ECB over counter blocks 0..63)
+    8: ("10b2ed0c72f16f23", "c87e4e35b0057c21b94a735ba202900ba1805629c59fd2dae7c7fc6c0457207c"),
+    16: ("f7bf965f22b45886", "082c4b6d017b279b18f24f22ea43e99338a5ca03dd1b2014845e013ddd713dc8"),
+}
+kat_counters = b"".join(i.to_bytes(8, "big") for i in range(bitslice_des.LANES))
+
+
+def kat_scalar(des):
+    return des.encrypt_block(kat_block), b"".join(
+        des.encrypt_block(kat_counters[i:i + 8]) for i in range(0, len(kat_counters), 8))
+
+
+def kat_pure_python(des):
+    # Generic unrolled rounds, used when numba is not installed
+    encrypt = lambda b: des._process_int(int.from_bytes(b, "big")).to_bytes(8, "big")
+    return encrypt(kat_block), b"".join(
+        encrypt(kat_counters[i:i + 8]) for i in range(0, len(kat_counters), 8))
+
+
+def kat_bitslice(des):
+    blocks = np.frombuffer(kat_block * bitslice_des.LANES, dtype=">u8").astype(np.uint64)
+    single = bitslice_des.encrypt_blocks(blocks, des.subkeys)[:1].astype(">u8").tobytes()
+    counters = np.frombuffer(kat_counters, dtype=">u8").astype(np.uint64)
+    return single, bitslice_des.encrypt_blocks(counters, des.subkeys).astype(">u8").tobytes()
+
+
+def kat_fast(des):
+    return des.encrypt_block(kat_block), des.encrypt_ecb(kat_counters)
+
+
+kat_engines = [
+    ("DES scalar", des_core.DES, kat_scalar),
+    ("DES pure-Python", des_core.DES, kat_pure_python),
+    ("Bitslice", des_core.DES, kat_bitslice),
+]
+if des_core.FastDES is not None:
+    kat_engines.append(("FastDES", des_core.FastDES, kat_fast))
+
+print("\n🔑 Known-answer checks")
+for (engine_name, engine_cls, run), (rounds, (want_block, want_digest)) in itertools.product(
+        kat_engines, kat_vectors.items()):
+    if engine_name == "FastDES" and rounds != 16:
+        continue  # OpenSSL only runs the standard 16 rounds
+    total_tests += 1
+    try:
+        block, ecb = run(engine_cls(kat_key, rounds=rounds))
+        ok = block.hex() == want_block and hashlib.sha256(ecb).hexdigest() == want_digest
+        status = "✅ PASS" if ok else "❌ FAIL"
+        if ok:
+            passed_tests += 1
+    except Exception as e:
+        status = f"❌ ERROR: {e}"
+    print(f"[KAT] Engine={engine_name}, Rounds={rounds} → {status}")
+    report_lines.append(f"KAT,{engine_name},{rounds},{status}")
+
 # --- Summary ---
 print("\n=============================")
 print(f"Completed {total_tests} tests")